@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from typing import Any, Optional
 
 from fastapi import APIRouter, HTTPException
@@ -31,16 +32,22 @@ class PipelineResponse(BaseModel):
     env_augment_spec: dict
 
 
+@functools.lru_cache(maxsize=1)
+def _load_default_house_summary() -> str:
+    """Summarize ProcTHOR-10K train[0]; pinned revision, so computed once per process.
+
+    The dataset is loaded through the uncached loader (__wrapped__) so the long-running server
+    keeps only this summary string, not the whole ProcTHOR-10K DatasetDict.
+    """
+    from src.envs.ai2thor.procthor_adapter import load_procthor_10k
+    house = load_procthor_10k.__wrapped__()["train"][0]
+    return get_house_summary(house)
+
+
 def _default_house_summary() -> str:
     """Load ProcTHOR-10K train[0] and return its summary."""
     try:
-        import prior
-        dataset = prior.load_dataset(
-            "procthor-10k",
-            revision="ab3cacd0fc17754d4c080a3fd50b18395fae8647",
-        )
-        house = dataset["train"][0]
-        return get_house_summary(house)
+        return _load_default_house_summary()
     except Exception as e:
         return f"House summary unavailable (prior/dataset error: {e}). Use house with rooms: room|1 (Kitchen), room|2 (LivingRoom)."
 
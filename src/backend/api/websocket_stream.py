@@ -1,6 +1,7 @@
 """WebSocket streaming handler for real-time game viewport and control."""
 
 import asyncio
+import base64
 import json
 from typing import Any, Optional
 
@@ -9,6 +10,19 @@ from fastapi import WebSocket, WebSocketDisconnect
 from PIL import Image
 import io
 
+try:
+    # SIMD base64 (optional); encodes straight to str without an intermediate bytes object
+    from pybase64 import b64encode_as_string as _b64encode_str
+except ImportError:
+    def _b64encode_str(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+try:
+    # libjpeg-turbo JPEG encoder (optional); several times faster than PIL's encoder
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
 from envs.ai2thor.thor_env import ThorEnv, THOR_DISCRETE_ACTIONS
 from ..schemas import SceneSpec, TaskSpec, RewardSpec
 from . import rl_state
@@ -70,10 +84,18 @@ class GameStreamManager:
             rgb_array = np.clip(rgb_array, 0, 255).astype(np.uint8)
         
         # Encode RGB array to JPEG with high quality
-        pil_image = Image.fromarray(rgb_array.astype(np.uint8))
-        jpeg_buffer = io.BytesIO()
-        pil_image.save(jpeg_buffer, format="JPEG", quality=self.jpeg_quality, optimize=False)
-        jpeg_bytes = jpeg_buffer.getvalue()
+        if simplejpeg is not None:
+            jpeg_bytes = simplejpeg.encode_jpeg(
+                np.ascontiguousarray(rgb_array, dtype=np.uint8),
+                quality=self.jpeg_quality,
+                colorspace="RGB",
+            )
+        else:
+            pil_image = Image.fromarray(rgb_array.astype(np.uint8))
+            jpeg_buffer = io.BytesIO()
+            pil_image.save(jpeg_buffer, format="JPEG", quality=self.jpeg_quality, optimize=False)
+            # Zero-copy view of the encoded JPEG (getvalue() would copy the buffer)
+            jpeg_bytes = jpeg_buffer.getbuffer()
 
         # Derived for backward compat: "agent" when RL process running, else "user"
         control_mode = "agent" if rl_state.is_rl_agent_running() else "user"
@@ -82,7 +104,7 @@ class GameStreamManager:
         # Create message payload
         message = {
             "type": "frame",
-            "jpeg_base64": __import__("base64").b64encode(jpeg_bytes).decode("utf-8"),
+            "jpeg_base64": _b64encode_str(jpeg_bytes),
             "metrics": metrics_with_mode,
         }
 
@@ -231,21 +253,40 @@ class GameStreamManager:
         
         try:
             from ai2thor.controller import Controller
-            
-            # Close the current environment's controller
-            if self.env._controller:
-                self.env._controller.stop()
-            
-            # Create new controller with the edited house (High quality)
-            new_controller = Controller(
-                scene=scene_dict,
-                width=self.render_width,
-                height=self.render_height,
-                quality="Very High",
-                gridSize=0.25,
-                visibilityDistance=1.5,
-            )
-            
+
+            # Reuse the running Unity process: reset() with a house dict issues CreateHouse,
+            # which is far cheaper than stopping and respawning the controller.
+            new_controller = self.env._controller
+            if new_controller is not None:
+                try:
+                    event = new_controller.reset(
+                        scene=scene_dict,
+                        width=self.render_width,
+                        height=self.render_height,
+                        gridSize=0.25,
+                        visibilityDistance=1.5,
+                    )
+                    if not event.metadata.get("lastActionSuccess", False):
+                        raise RuntimeError(event.metadata.get("errorMessage") or "CreateHouse failed")
+                except Exception as e:
+                    print(f"[WebSocket] Reusing controller failed ({e}); restarting AI2-THOR")
+                    try:
+                        new_controller.stop()
+                    except Exception:
+                        pass
+                    new_controller = None
+
+            if new_controller is None:
+                # Create new controller with the edited house (High quality)
+                new_controller = Controller(
+                    scene=scene_dict,
+                    width=self.render_width,
+                    height=self.render_height,
+                    quality="Very High",
+                    gridSize=0.25,
+                    visibilityDistance=1.5,
+                )
+
             # Update the environment's controller and scene for reset
             self.env._controller = new_controller
             self.env._last_event = None
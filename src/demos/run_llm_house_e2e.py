@@ -11,6 +11,7 @@ Loads .env from repo root automatically. Requires GEMINI_API_KEY or GOOGLE_API_K
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -37,6 +38,22 @@ from src.envs.ai2thor.procthor_adapter import (
     get_builtin_scene_for_spec,
     get_ithor_scene_names,
 )
+from src.envs.ai2thor.thor_env import ThorEnv
+from src.tools.keyboard_control import run_keyboard_loop
+
+# Only the third-party simulator is optional here; import errors from the repo's own modules surface as-is
+try:
+    from ai2thor.controller import Controller
+    _HAS_THOR = True
+except ImportError:
+    Controller = None
+    _HAS_THOR = False
+
+
+def _stop_controller_when_ready(future) -> None:
+    """Done-callback: stop a background-started Controller once it exists."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().stop()
 
 
 def run_workflow(
@@ -45,36 +62,21 @@ def run_workflow(
     width: int = 400,
     height: int = 300,
     use_global_keys: bool = True,
+    benchmark_steps: Optional[int] = None,
 ):
     """Run full pipeline: user input -> (optional) Orchestrator LLM -> pick built-in scene -> Controller -> ThorEnv -> keyboard drive."""
-    from ai2thor.controller import Controller
+    if not _HAS_THOR:
+        raise RuntimeError("ai2thor is not installed; run: pip install -r requirements.txt")
     from src.backend.llm import get_api_key, run_orchestrator_llm
 
     print("[E2E] User input:", user_input)
     print("[E2E] Mode: built-in scenes only (no 10K, no CreateHouse).")
 
-    declarative = None
-    if use_llm and get_api_key():
-        print("[E2E] Running Orchestrator LLM (user input -> DeclarativeSpec)...")
-        print("[E2E] Calling Orchestrator LLM...")
-        declarative = run_orchestrator_llm(user_input)
-        from src.tools.validators.declarative_spec import validate_declarative_spec_strict
-        validate_declarative_spec_strict(declarative)
-        print("[E2E] DeclarativeSpec:", {
-            "goal_type": declarative.goal_type,
-            "room_preferences": declarative.room_preferences,
-            "room_spec_id": declarative.room_spec_id,
-            "object_requests": declarative.object_requests,
-            "task_focus": declarative.task_focus,
-        })
-    else:
-        if not use_llm:
-            print("[E2E] Skipping LLM (--no-llm).")
-        else:
-            print("[E2E] No API key; skipping LLM.")
-
-    print("[E2E] Creating AI2-THOR Controller (this may take 30-60 seconds on first run)...")
-    controller = Controller(
+    # Start Unity while the LLM runs: both are independent blocking waits, so overlap them
+    print("[E2E] Creating AI2-THOR Controller in the background (this may take 30-60 seconds on first run)...")
+    executor = ThreadPoolExecutor(max_workers=1)
+    controller_future = executor.submit(
+        Controller,
         #branch="main",
         agentMode="default",
         quality="Very High",
@@ -86,25 +88,58 @@ def run_workflow(
         gridSize=0.25,
         rotateStepDegrees=90.0,
     )
+    executor.shutdown(wait=False)
+
+    declarative = None
+    try:
+        if use_llm and get_api_key():
+            print("[E2E] Running Orchestrator LLM (user input -> DeclarativeSpec)...")
+            print("[E2E] Calling Orchestrator LLM...")
+            declarative = run_orchestrator_llm(user_input)
+            from src.tools.validators.declarative_spec import validate_declarative_spec_strict
+            validate_declarative_spec_strict(declarative)
+            print("[E2E] DeclarativeSpec:", {
+                "goal_type": declarative.goal_type,
+                "room_preferences": declarative.room_preferences,
+                "room_spec_id": declarative.room_spec_id,
+                "object_requests": declarative.object_requests,
+                "task_focus": declarative.task_focus,
+            })
+        else:
+            if not use_llm:
+                print("[E2E] Skipping LLM (--no-llm).")
+            else:
+                print("[E2E] No API key; skipping LLM.")
+    except BaseException:
+        # Don't leave the Unity process running if the LLM step fails, but don't wait for it to
+        # finish starting either: cancel if not started, else stop it from a done-callback
+        if not controller_future.cancel():
+            controller_future.add_done_callback(_stop_controller_when_ready)
+        raise
+
+    print("[E2E] Waiting for AI2-THOR Controller...")
+    controller = controller_future.result()
     # Prefer iTHOR scene list (FloorPlan*_physics) when available so we don't get ArchitecTHOR-only from scenes_in_build
-    scene_names = get_ithor_scene_names(controller) or get_builtin_scene_names(controller)
-    print("[E2E] Built-in scenes in this build: %d (e.g. %s)" % (len(scene_names), ", ".join(scene_names[:5]) + ("..." if len(scene_names) > 5 else "")))
+    ithor_names = get_ithor_scene_names(controller)
+    scenes_are_ithor = ithor_names is not None
+    scene_names = ithor_names or get_builtin_scene_names(controller)
+    ellipsis = "..." if len(scene_names) > 5 else ""
+    print("[E2E] Built-in scenes in this build: %d (e.g. %s%s)" % (len(scene_names), ", ".join(scene_names[:5]), ellipsis))
     room_spec_id = declarative.room_spec_id if declarative else None
     room_preferences = declarative.room_preferences if declarative else None
     chosen_scene = get_builtin_scene_for_spec(
         room_spec_id=room_spec_id,
         room_preferences=room_preferences,
         scene_names=scene_names,
+        scenes_are_ithor=scenes_are_ithor,
     )
     print("[E2E] Chosen built-in scene: %s" % chosen_scene)
-    controller.reset(scene=chosen_scene)
+    # reset() is synchronous: the scene is loaded (or has failed) once it returns, so no wait is needed
+    event = controller.reset(scene=chosen_scene)
+    if not event.metadata.get("lastActionSuccess"):
+        print("[E2E] WARNING: reset(scene=%r) reported failure: %s" % (
+            chosen_scene, event.metadata.get("errorMessage")), file=sys.stderr)
     print("[E2E] Controller created successfully.")
-    import time
-    print("[E2E] Waiting 3s for Unity to finish initializing before reset...")
-    time.sleep(3)
-
-    from src.envs.ai2thor.thor_env import ThorEnv
-    from src.tools.keyboard_control import run_keyboard_loop
 
     print("[E2E] Creating ThorEnv wrapper...")
     env = ThorEnv(controller=controller, width=width, height=height)
@@ -120,7 +155,12 @@ def run_workflow(
         else:
             print("Terminal mode: keep this terminal focused.")
         print()
-        run_keyboard_loop(env, use_global_keys=use_global_keys)
+        run_keyboard_loop(
+            env,
+            use_global_keys=use_global_keys,
+            bench_mode=benchmark_steps is not None,
+            bench_steps=benchmark_steps or 0,
+        )
         return True
     except TimeoutError:
         print("\n[E2E] AI2-THOR backend timed out during env.reset() (Initialize step).", file=sys.stderr)
@@ -142,6 +182,7 @@ def main():
     ap.add_argument("--width", type=int, default=400)
     ap.add_argument("--height", type=int, default=300)
     ap.add_argument("--terminal", action="store_true", help="Read keys from terminal only (keep terminal focused)")
+    ap.add_argument("--benchmark", type=int, default=None, metavar="STEPS", help="Ignore input; step STEPS navigation actions as fast as possible and print timings as CSV")
     args = ap.parse_args()
     use_llm = not args.no_llm
     from src.backend.llm import get_api_key
@@ -154,6 +195,7 @@ def main():
         width=args.width,
         height=args.height,
         use_global_keys=not args.terminal,
+        benchmark_steps=args.benchmark,
     )
     sys.exit(0 if ok else 1)
 
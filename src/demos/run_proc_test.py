@@ -20,6 +20,7 @@ House sources
 -------------
   1. Example schema (--use-example-schema): canonical example house dict from ProcTHOR-10K.
   2. Dataset mode (default): load from ProcTHOR-10K by --split, --index, or --random.
+     Uses the latest revision; --revision SHA pins one and caches its houses on disk.
   3. Config mode (--config <room_spec_id>): try procedural generation; on failure fall back to 10K.
 
 Schema and inspection
@@ -154,19 +155,25 @@ Top-level keys: rooms, walls, doors, windows, objects, proceduralParameters, met
 """
 
 import argparse
+import copy
 import json
 import os
 import random
 import sys
+import tempfile
 from pathlib import Path
 
 # Ensure Docker/VNC shows progress immediately (no buffering)
 def _log(msg: str) -> None:
     print(msg, flush=True)
 
-import prior
 from ai2thor.controller import Controller
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ProcTHOR-10K split sizes
 SPLIT_SIZES = {"train": 10000, "val": 1000, "test": 1000}
 
@@ -181,6 +188,52 @@ VALID_ROOM_SPEC_IDS = [
 PROCTHOR_10K_REVISION = "ab3cacd0fc17754d4c080a3fd50b18395fae8647"
 
 
+# Per-house JSON cache so repeat runs skip loading the whole 10K dataset (pinned revisions only)
+HOUSE_CACHE_DIR = Path.home() / ".cache" / "dreamai" / "procthor10k"
+
+
+def _load_procthor_10k(revision=None):
+    """Load ProcTHOR-10K through the shared per-process cache (revision=None: latest)."""
+    from src.envs.ai2thor.procthor_adapter import load_procthor_10k
+    return load_procthor_10k(revision=revision)
+
+
+def _load_house_cached(split, index, revision=None):
+    """Return house split[index] of ProcTHOR-10K at revision.
+
+    Pinned revisions are cached per house under ~/.cache/dreamai/procthor10k/{revision}/; on a
+    miss the dataset is loaded and the single house is written there. revision=None loads the
+    latest revision and is never cached, since "latest" changes upstream.
+    """
+    if revision is None:
+        return _load_procthor_10k()[split][index]
+    path = HOUSE_CACHE_DIR / revision / f"{split}_{index}.json"
+    if path.is_file():
+        try:
+            data = path.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except ValueError:
+            # Corrupt entry (e.g. left by an older, non-atomic write): drop it and reload
+            _log(f"[run_proc_test] Discarding unreadable cached house {path}")
+            path.unlink(missing_ok=True)
+    house = _load_procthor_10k(revision)[split][index]
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = orjson.dumps(house) if orjson is not None else json.dumps(house).encode("utf-8")
+        # Write a temp file in the same directory and rename it over the entry, so an interrupted
+        # or concurrent run never leaves a truncated file behind
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            f.write(data)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError) as e:
+        _log(f"[run_proc_test] Could not cache house {split}[{index}]: {e}")
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+    return house
+
+
 def get_example_house_schema():
     """Return a canonical example house dict that conforms to the HouseDict schema.
 
@@ -188,23 +241,16 @@ def get_example_house_schema():
     Loads one house from ProcTHOR-10K (train[0]) so it is valid for CreateHouse.
     The returned value is already a dict; it is passed as Controller(scene=...).
     You can replace this with a minimal hand-built dict to test custom layouts.
+    Always read at PROCTHOR_10K_REVISION, so after the first run it comes from the disk cache.
     """
-    dataset = prior.load_dataset("procthor-10k")
-    return dataset["train"][0]
+    return _load_house_cached("train", 0, PROCTHOR_10K_REVISION)
 
 
-def _json_serializable(obj):
-    """Convert numpy/types for JSON dump."""
-    import numpy as np
-    if isinstance(obj, np.ndarray):
+def _json_default(obj):
+    """json/orjson default hook: numpy arrays and scalars become lists / Python numbers."""
+    if hasattr(obj, "tolist"):
         return obj.tolist()
-    if isinstance(obj, (np.integer, np.floating)):
-        return float(obj) if isinstance(obj, np.floating) else int(obj)
-    if isinstance(obj, dict):
-        return {k: _json_serializable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_json_serializable(v) for v in obj]
-    return obj
+    return str(obj)
 
 
 def print_example_dict(limit_objects=None, output_path=None):
@@ -215,31 +261,45 @@ def print_example_dict(limit_objects=None, output_path=None):
     instead of stdout.
     """
     house = get_example_house_schema()
-    house = _json_serializable(house)
     if limit_objects is not None and "objects" in house and isinstance(house["objects"], list):
-        kept = house["objects"][:limit_objects]
-        house = {**house, "objects": kept}
+        # Shallow copy so only the objects list is replaced; nested rooms/walls are shared, not rebuilt
+        house = copy.copy(house)
+        house["objects"] = house["objects"][:limit_objects]
         print(f"(objects truncated to {limit_objects} for readability)", file=sys.stderr)
-    text = json.dumps(house, indent=2)
+    # Numpy values are converted by the serializer's default hook; no Python-level pre-walk
+    if orjson is not None:
+        data = orjson.dumps(
+            house,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+            default=_json_default,
+        )
+    else:
+        # ensure_ascii=False matches orjson's raw UTF-8 so output doesn't depend on which is installed
+        data = json.dumps(house, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
     if output_path:
-        Path(output_path).write_text(text, encoding="utf-8")
+        Path(output_path).write_bytes(data)
         print(f"Wrote example house dict to {output_path}", file=sys.stderr)
     else:
-        print(text)
+        # Through the text layer: keeps ordering with print() and works with a replaced sys.stdout
+        sys.stdout.write(data.decode("utf-8") + "\n")
 
 
-def get_house_from_dataset(dataset, split="train", index=None, random_house=False, seed=None):
-    """Return (house_data dict, resolved_index) from ProcTHOR-10K."""
-    split_data = dataset[split]
-    n = len(split_data)
+def _resolve_house_index(split, n, index=None, random_house=False, seed=None):
+    """Return the house index to load from a split of n houses (random, explicit, or 0)."""
     if random_house:
         if seed is not None:
             random.seed(seed)
-        resolved_index = random.randint(0, n - 1)
-    else:
-        resolved_index = index if index is not None else 0
-        if resolved_index < 0 or resolved_index >= n:
-            raise ValueError(f"House index must be 0..{n - 1} for split '{split}', got {resolved_index}")
+        return random.randint(0, n - 1)
+    resolved_index = index if index is not None else 0
+    if resolved_index < 0 or resolved_index >= n:
+        raise ValueError(f"House index must be 0..{n - 1} for split '{split}', got {resolved_index}")
+    return resolved_index
+
+
+def get_house_from_dataset(dataset, split="train", index=None, random_house=False, seed=None):
+    """Return (house_data dict, resolved_index) from ProcTHOR-10K."""
+    split_data = dataset[split]
+    resolved_index = _resolve_house_index(split, len(split_data), index, random_house, seed)
     return split_data[resolved_index], resolved_index
 
 
@@ -253,11 +313,13 @@ def run_demo(
     index=None,
     random_house=False,
     dataset_seed=None,
+    dataset_revision=None,
     physics_scene=None,
     fullscreen=True,
     use_global_keys=True,
     width=800,
     height=600,
+    benchmark_steps=None,
 ):
     """Load or generate a house, then run keyboard-controlled demo.
 
@@ -288,27 +350,26 @@ def run_demo(
         )
 
     def _load_house_from_dataset(_split, _index, _random, _seed):
+        # IMPORTANT: do not pin old revision while debugging (pass --revision to opt into the disk cache)
         _log("Loading ProcTHOR-10K...")
-        # IMPORTANT: do not pin old revision while debugging
-        dataset = prior.load_dataset("procthor-10k")
-        h, resolved = get_house_from_dataset(
-            dataset, split=_split, index=_index, random_house=_random, seed=_seed
-        )
-        return h, f"10K {_split}[{resolved}]"
+        # Resolve the index first (split sizes are fixed), then deserialize only that house
+        resolved = _resolve_house_index(_split, SPLIT_SIZES[_split], _index, _random, _seed)
+        return _load_house_cached(_split, resolved, dataset_revision), f"10K {_split}[{resolved}]"
 
     def _create_house_and_spawn(ctrl: Controller, house: dict):
+        # Setup steps skip the Unity render + frame copy; the RotateRight confirmation step renders
         _log("[run_proc_test] CreateHouse...")
-        evt = ctrl.step(action="CreateHouse", house=house)
+        evt = ctrl.step(action="CreateHouse", house=house, renderImage=False)
         print("CreateHouse success:", evt.metadata.get("lastActionSuccess"))
         print("CreateHouse error:", evt.metadata.get("errorMessage"))
 
         _log("[run_proc_test] Initialize...")
-        evt = ctrl.step(action="Initialize", gridSize=0.25)
+        evt = ctrl.step(action="Initialize", gridSize=0.25, renderImage=False)
         print("Initialize success:", evt.metadata.get("lastActionSuccess"))
         print("Initialize error:", evt.metadata.get("errorMessage"))
 
         _log("[run_proc_test] GetReachablePositions...")
-        evt = ctrl.step(action="GetReachablePositions")
+        evt = ctrl.step(action="GetReachablePositions", renderImage=False)
         rp = evt.metadata.get("actionReturn") or []
         print("reachable count:", len(rp))
 
@@ -320,7 +381,7 @@ def run_demo(
 
         # Teleport to a guaranteed valid navmesh location
         p = rp[0]
-        evt = ctrl.step(action="Teleport", position=p, forceAction=True)
+        evt = ctrl.step(action="Teleport", position=p, forceAction=True, renderImage=False)
         print("Teleport to reachable:", evt.metadata.get("lastActionSuccess"), evt.metadata.get("errorMessage"))
         agent = evt.metadata.get("agent") or {}
         pos = (agent.get("position") or {})
@@ -384,10 +445,10 @@ def run_demo(
                     house_data = house.data if hasattr(house, "data") else None
                     source = f"generated ({config}, seed={config_seed})"
                     # Try to teleport onto reachable positions even for generated scenes
-                    evt = controller.step(action="GetReachablePositions")
+                    evt = controller.step(action="GetReachablePositions", renderImage=False)
                     rp = evt.metadata.get("actionReturn") or []
                     if rp:
-                        controller.step(action="Teleport", position=rp[0], forceAction=True)
+                        controller.step(action="Teleport", position=rp[0], forceAction=True, renderImage=False)
                 except Exception as e:
                     _log(f"[run_proc_test] Generation failed: {e}")
                     controller = None
@@ -436,7 +497,12 @@ def run_demo(
     env = ThorEnv(controller=controller, width=width, height=height, render_mode="rgb_array")
     env._last_event = controller.last_event  # Sync so first step has metadata for Pickup/Toggle
     try:
-        run_keyboard_loop(env, use_global_keys=use_global_keys)
+        run_keyboard_loop(
+            env,
+            use_global_keys=use_global_keys,
+            bench_mode=benchmark_steps is not None,
+            bench_steps=benchmark_steps or 0,
+        )
     finally:
         env.close()
 
@@ -480,6 +546,13 @@ def main():
         default=None,
         help="House index in split when using 10K (default: 0)",
     )
+    parser.add_argument(
+        "--revision",
+        type=str,
+        default=None,
+        metavar="SHA",
+        help="ProcTHOR-10K revision to load (default: latest). Pinned revisions are cached per house on disk.",
+    )
     parser.add_argument(
         "--random",
         action="store_true",
@@ -490,6 +563,13 @@ def main():
     parser.add_argument("--width", type=int, default=800, help="Window width (default: 800)")
     parser.add_argument("--height", type=int, default=600, help="Window height (default: 600)")
     parser.add_argument("--terminal", action="store_true", help="Read keys from terminal only")
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        default=None,
+        metavar="STEPS",
+        help="Ignore input; step STEPS navigation actions as fast as possible and print timings as CSV",
+    )
     parser.add_argument(
         "--print-schema",
         action="store_true",
@@ -544,11 +624,13 @@ def main():
         index=args.index,
         random_house=args.random,
         dataset_seed=args.seed if args.random else None,
+        dataset_revision=args.revision,
         physics_scene=args.physics_scene,
         fullscreen=not args.no_fullscreen,
         use_global_keys=not args.terminal,
         width=args.width,
         height=args.height,
+        benchmark_steps=args.benchmark,
     )
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import random
 from typing import Any, Optional
 
@@ -90,16 +91,22 @@ def get_builtin_scene_for_spec(
     room_spec_id: Optional[str] = None,
     room_preferences: Optional[list[str]] = None,
     scene_names: Optional[list[str]] = None,
+    scenes_are_ithor: bool = False,
 ) -> str:
     """Pick a built-in scene name that matches the LLM spec. Uses FloorPlan*_physics candidates only.
 
     When scene_names come from controller.ithor_scenes() we get the 120 iTHOR scenes. If the build
     has only ArchitecTHOR, we sample from those instead (no room-type mapping).
+    Pass scenes_are_ithor=True when scene_names is already the iTHOR list to skip re-filtering it.
     """
     if not scene_names:
         return DEFAULT_BUILTIN_SCENE
-    ithor_only = _ithor_floorplan_scenes(scene_names)
-    architecthor_only = _architecthor_scenes(scene_names)
+    if scenes_are_ithor:
+        ithor_only = scene_names
+        architecthor_only: list[str] = []
+    else:
+        ithor_only = _ithor_floorplan_scenes(scene_names)
+        architecthor_only = _architecthor_scenes(scene_names)
     scene_set = set(ithor_only) if ithor_only else set(scene_names)
     candidates: list[str] = []
     key_source: str = "none"
@@ -159,6 +166,18 @@ def get_procthor_room_spec_ids() -> list[str]:
         ]
 
 
+@functools.lru_cache(maxsize=4)
+def load_procthor_10k(revision: Optional[str] = PROCTHOR_10K_REVISION) -> Any:
+    """Load the ProcTHOR-10K dataset via prior, once per process per revision.
+
+    Pass revision=None for the latest revision. Shared by the demos and API routes so repeated
+    lookups in one process don't re-read the dataset.
+    """
+    import prior
+
+    return prior.load_dataset("procthor-10k", revision=revision)
+
+
 def get_house_from_10k_by_room_spec(
     room_spec_ids: Optional[list[str]] = None,
     revision: str = PROCTHOR_10K_REVISION,
@@ -174,9 +193,7 @@ def get_house_from_10k_by_room_spec(
     Returns:
         House dict (rooms, objects, metadata, ...) for use with apply_edits / CreateHouse.
     """
-    import prior
-
-    dataset = prior.load_dataset("procthor-10k", revision=revision)
+    dataset = load_procthor_10k(revision)
     try:
         split_data = dataset[split]
     except (KeyError, TypeError) as e:
@@ -2,43 +2,94 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import gymnasium as gym
 import numpy as np
 from tools.actions import THOR_DISCRETE_ACTIONS
 
 
-def _get_closest_pickable_object(metadata: dict) -> Optional[str]:
-    """Get objectId of closest visible pickable object from event metadata."""
-    interactable_ids = metadata.get("interactableObjectIds", [])
-    objects = metadata.get("objects", [])
-    if interactable_ids:
-        visible = [o for o in objects if o.get("objectId") in interactable_ids and o.get("visible")]
-        if visible:
-            return visible[0].get("objectId")
-        return interactable_ids[0] if interactable_ids else None
-    pickupable = [o for o in objects if o.get("visible") and o.get("pickupable")]
-    if pickupable:
-        return pickupable[0].get("objectId")
-    visible = [o for o in objects if o.get("visible")]
-    return visible[0].get("objectId") if visible else None
+def _get_closest_pickable_object(objects: list, interactable_ids: list) -> Optional[str]:
+    """Get objectId of closest visible pickable object from event metadata objects.
 
+    Single pass over objects, keeping the nearest candidate by metadata "distance" for each
+    tier (interactable, else pickupable, else any visible). Objects without a distance keep
+    Unity's emission order.
+    """
+    inf = float("inf")
+    ids = set(interactable_ids) if interactable_ids else None
+    best, best_d = None, inf
+    fallback, fallback_d = None, inf
+    for o in objects:
+        if not o.get("visible"):
+            continue
+        d = o.get("distance", inf)
+        if ids is not None:
+            if o.get("objectId") in ids and (best is None or d < best_d):
+                best, best_d = o, d
+        elif o.get("pickupable"):
+            if best is None or d < best_d:
+                best, best_d = o, d
+        elif fallback is None or d < fallback_d:
+            fallback, fallback_d = o, d
+    if best is not None:
+        return best.get("objectId")
+    if ids is not None:
+        return interactable_ids[0]
+    return fallback.get("objectId") if fallback is not None else None
 
-def _get_closest_toggleable_object(metadata: dict) -> tuple[Optional[str], bool]:
+
+def _get_closest_toggleable_object(
+    objects: list, interactable_ids: list
+) -> tuple[Optional[str], bool]:
     """Get (objectId, is_toggled_on) for closest visible toggleable object."""
-    interactable_ids = metadata.get("interactableObjectIds", [])
-    objects = metadata.get("objects", [])
-    toggleable = [o for o in objects if o.get("visible") and o.get("toggleable")]
-    if toggleable:
-        o = toggleable[0]
+    inf = float("inf")
+    ids = set(interactable_ids) if interactable_ids else None
+    best, best_d = None, inf
+    fallback, fallback_d = None, inf
+    for o in objects:
+        if not o.get("visible"):
+            continue
+        d = o.get("distance", inf)
+        if o.get("toggleable"):
+            if best is None or d < best_d:
+                best, best_d = o, d
+        elif best is None and ids is not None and o.get("objectId") in ids:
+            if fallback is None or d < fallback_d:
+                fallback, fallback_d = o, d
+    o = best if best is not None else fallback
+    if o is not None:
         return (o.get("objectId"), o.get("isToggled", False))
-    if interactable_ids and objects:
-        for o in objects:
-            if o.get("objectId") in interactable_ids and o.get("visible"):
-                return (o.get("objectId"), o.get("isToggled", False))
     return (None, False)
 
+
+def _step_pickup(env: "ThorEnv", action_name: str, objects: list, interactable_ids: list) -> Any:
+    obj_id = _get_closest_pickable_object(objects, interactable_ids)
+    if obj_id:
+        return env._thor_step(action_name, objectId=obj_id)
+    return env._thor_step("Pass")  # No target; no-op
+
+
+def _step_toggle(env: "ThorEnv", action_name: str, objects: list, interactable_ids: list) -> Any:
+    obj_id, is_on = _get_closest_toggleable_object(objects, interactable_ids)
+    if obj_id:
+        toggle_action = "ToggleObjectOff" if is_on else "ToggleObjectOn"
+        return env._thor_step(toggle_action, objectId=obj_id)
+    return env._thor_step("Pass")
+
+
+def _step_drop(env: "ThorEnv", action_name: str, objects: list, interactable_ids: list) -> Any:
+    return env._thor_step(action_name, forceAction=True)
+
+
+# Actions that need target resolution or extra kwargs; everything else is a plain _thor_step
+_ACTION_HANDLERS: dict[str, Callable[["ThorEnv", str, list, list], Any]] = {
+    "PickupObject": _step_pickup,
+    "ToggleObjectOn": _step_toggle,
+    "DropHandObject": _step_drop,
+}
+
+
 def _get_ai2thor_controller(
     scene_name: Optional[str] = None,
     existing_controller: Any = None,
@@ -247,23 +298,14 @@ class ThorEnv(gym.Env):
         """Step with a discrete action index. Pickup/Toggle/Drop resolve objectId from metadata."""
         action_name = THOR_DISCRETE_ACTIONS[action]
         meta = getattr(self._last_event, "metadata", None) or {} if self._last_event else {}
+        # Bind the object lists once per step; the resolvers below scan them directly
+        objects = meta.get("objects") or []
+        interactable_ids = meta.get("interactableObjectIds") or []
 
         # Object-based actions require objectId (and Drop uses forceAction)
-        if action_name == "PickupObject":
-            obj_id = _get_closest_pickable_object(meta)
-            if obj_id:
-                self._thor_step(action_name, objectId=obj_id)
-            else:
-                self._thor_step("Pass")  # No target; no-op
-        elif action_name == "ToggleObjectOn":
-            obj_id, is_on = _get_closest_toggleable_object(meta)
-            if obj_id:
-                toggle_action = "ToggleObjectOff" if is_on else "ToggleObjectOn"
-                self._thor_step(toggle_action, objectId=obj_id)
-            else:
-                self._thor_step("Pass")
-        elif action_name == "DropHandObject":
-            self._thor_step(action_name, forceAction=True)
+        handler = _ACTION_HANDLERS.get(action_name)
+        if handler is not None:
+            handler(self, action_name, objects, interactable_ids)
         else:
             self._thor_step(action_name)
 
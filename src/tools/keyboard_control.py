@@ -3,25 +3,37 @@ Shared keyboard control loop for ProcTHOR demo scripts.
 
 Uses ThorEnv.step() as the single source of action execution (Pickup/Drop/Toggle
 object resolution is handled inside ThorEnv). Supports two input modes:
-- Global keys: Uses pynput so WASD/QE/X work even when the AI2-THOR window is focused.
+- Global keys: Uses pynput's Events API so WASD/QE/X work even when the AI2-THOR window is focused.
 - Terminal: Read keys from stdin only (must keep terminal focused).
 
 Notes:
+- env.step() runs on a dedicated worker thread fed by a small mailbox, so key input keeps
+  draining while AI2-THOR blocks on Unity IPC. A newer move/look overwrites a pending one;
+  Pickup/Drop/Toggle are never coalesced.
 - Keys normalized to lowercase so Shift/CapsLock doesn't break controls.
 - P=pick up, L=drop, T=toggle, X=quit.
 """
 
 from __future__ import annotations
 
-import queue
+import collections
+import contextlib
+import os
+import selectors
 import sys
 import termios
 import threading
+import time
 import tty
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Optional
 
 from tools.actions import THOR_DISCRETE_ACTIONS
 
+# Immutable snapshot of the action table; everything below indexes this instead of the shared list
+_ACTION_NAMES: tuple[str, ...] = tuple(THOR_DISCRETE_ACTIONS)
+_NUM_ACTIONS = len(_ACTION_NAMES)
 
 # Map keyboard keys -> discrete action IDs (must align with THOR_DISCRETE_ACTIONS indices)
 KEY_ACTIONS = {
@@ -36,19 +48,142 @@ KEY_ACTIONS = {
     "t": 8,  # ToggleObjectOn (ThorEnv resolves to On/Off based on object state)
 }
 
-# Quit keys (we normalize input to lowercase, so only include lowercase)
-QUIT_KEYS = ("x", "\x03")  # x or Ctrl+C
+# Key -> (action_id, action_name), built once at import; ids outside THOR_DISCRETE_ACTIONS are dropped here
+KEY_TO_ACTION: dict[str, tuple[int, str]] = {
+    k: (aid, _ACTION_NAMES[aid])
+    for k, aid in KEY_ACTIONS.items()
+    if 0 <= aid < _NUM_ACTIONS
+}
 
+# ASCII code -> action_id (-1 = unbound): the hot loop indexes this instead of hashing the key string
+_KEY_LUT = array("b", [-1] * 128)
+for _k, (_aid, _name) in KEY_TO_ACTION.items():
+    if ord(_k) < 128:
+        _KEY_LUT[ord(_k)] = _aid
+del _k, _aid, _name
+
+# action_id -> the (action_id, action_name) entry posted to the step worker
+_ACTION_ENTRIES = tuple(enumerate(_ACTION_NAMES))
+
+# Held-key navigation: a newer press may replace one still waiting for the worker.
+# Pickup/Drop/Toggle change scene state, so they are never dropped or reordered.
+LATEST_WINS_ACTIONS = frozenset(
+    _ACTION_NAMES.index(name)
+    for name in ("MoveAhead", "MoveBack", "RotateLeft", "RotateRight", "LookUp", "LookDown")
+)
+
+# Keys whose queued presses may be collapsed to the newest one when input backs up
+COALESCE_KEYS = frozenset(k for k, (aid, _) in KEY_TO_ACTION.items() if aid in LATEST_WINS_ACTIONS)
+
+# Quit keys (we normalize input to lowercase, so only include lowercase). Raw terminal mode
+# receives Ctrl+C as "\x03"; with pynput the terminal is cooked, so Ctrl+C arrives as SIGINT.
+_QUIT_TERM = frozenset({"x", "\x03"})
+_QUIT_PYNPUT = frozenset({"x"})
+
+
+class _RawStdin:
+    """Keep the terminal in raw mode for a whole session (set up once, restored on exit).
+
+    Output post-processing is kept on so status lines still start at column 0.
+    """
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+        self._old: Optional[list] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+
+    def __enter__(self) -> "_RawStdin":
+        # Registered once; each wait() is then a single poll/epoll call on the fd
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.fd, selectors.EVENT_READ)
+        self._old = termios.tcgetattr(self.fd)
+        tty.setraw(self.fd)
+        mode = termios.tcgetattr(self.fd)
+        mode[1] |= termios.OPOST
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, mode)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._old is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._old)
+            self._old = None
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Return True once a key is ready to read, False if timeout (seconds) elapses first."""
+        return bool(self._selector.select(timeout))
+
+    def read_key(self) -> str:
+        """Read one key from the already-raw fd (a single read syscall); "" for non-ASCII bytes."""
+        data = os.read(self.fd, 1)
+        if not data:
+            return ""
+        o = data[0]
+        if 65 <= o <= 90:  # ASCII A-Z -> a-z without str.lower()
+            o |= 0x20
+        return chr(o) if o < 128 else ""
 
-def _terminal_get_key() -> str:
-    """Read one key from stdin (Unix/macOS). Requires terminal focus."""
-    fd = sys.stdin.fileno()
-    old = termios.tcgetattr(fd)
-    try:
-        tty.setraw(fd)
-        return sys.stdin.read(1)
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+def _key_char(key: Any) -> Optional[str]:
+    """Return the lowercase character for a pynput key, or None for special keys."""
+    k = getattr(key, "char", None)
+    # Special keys have no char; some platforms report unmapped keys as "\x00" (shown as <0>)
+    if not k or k == "\x00":
+        return None
+    if len(k) == 1:
+        o = ord(k)
+        # Already-lowercase keys are returned as-is; ASCII A-Z is folded without str.lower()
+        return chr(o | 0x20) if 65 <= o <= 90 else k
+    return k.lower()
+
+
+def _extract_dict_pose(info: dict) -> tuple[float, float, float, float]:
+    """Pose from ThorEnv's info schema: position and rotation are both {x, y, z} dicts."""
+    pos = info["agent_position"]
+    return pos["x"], pos["y"], pos["z"], info["agent_rotation"]["y"]
+
+
+def _extract_any_pose(info: dict) -> tuple[float, float, float, float]:
+    """Tolerant pose extraction for envs with missing fields or a scalar rotation."""
+    pos = info.get("agent_position")
+    if not isinstance(pos, dict):
+        pos = {}
+    rot = info.get("agent_rotation")
+    ry = rot.get("y", 0) if isinstance(rot, dict) else rot
+    return pos.get("x") or 0, pos.get("y") or 0, pos.get("z") or 0, ry or 0
+
+
+# Default action cycle for bench_mode (navigation only, so the scene never runs out of targets)
+BENCH_ACTIONS = ("MoveAhead", "RotateRight", "MoveBack", "RotateLeft", "LookUp", "LookDown")
+
+
+def _run_benchmark(env: Any, bench_actions: list[str], bench_steps: int) -> None:
+    """Step env through bench_actions as fast as possible, printing CSV rows and steps/sec.
+
+    Double-buffered: step N+1 is submitted to a worker thread before row N is formatted and
+    printed, so Unity renders the next frame while Python does the bookkeeping.
+    """
+    action_ids = [_ACTION_NAMES.index(name) for name in bench_actions]
+
+    def timed_step(action_id: int) -> tuple[int, dict, float]:
+        t0 = time.perf_counter()
+        obs, reward, terminated, truncated, info = env.step(action_id)
+        return action_id, info, (time.perf_counter() - t0) * 1000.0
+
+    print("action_name,success,elapsed_ms")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(timed_step, action_ids[0]) if bench_steps > 0 else None
+        for i in range(1, bench_steps + 1):
+            action_id, info, elapsed_ms = pending.result()
+            if i < bench_steps:
+                pending = pool.submit(timed_step, action_ids[i % len(action_ids)])
+            action_name = info.get("action_name", _ACTION_NAMES[action_id])
+            print("%s,%d,%.2f" % (action_name, bool(info.get("last_action_success", True)), elapsed_ms))
+    total = time.perf_counter() - start
+    print(f"[bench] {bench_steps} steps in {total:.2f}s ({bench_steps / total if total else 0.0:.1f} steps/s)")
 
 
 def run_keyboard_loop(
@@ -56,6 +191,11 @@ def run_keyboard_loop(
     use_global_keys: bool = True,
     on_action: Optional[Callable[[str, bool, dict], None]] = None,
     debug_keys: bool = False,
+    bench_mode: bool = False,
+    bench_actions: Optional[list[str]] = None,
+    bench_steps: int = 200,
+    min_interval: float = 0.08,
+    min_step_interval: float = 1 / 30,
 ) -> None:
     """Run the WASD/QE/X control loop until user presses X or Ctrl+C.
 
@@ -66,13 +206,35 @@ def run_keyboard_loop(
             If pynput is not installed or fails, falls back to terminal input.
         on_action: Optional callback(action_name, success, info) after each step.
         debug_keys: If True, prints every received key and the input mode.
+        bench_mode: If True, ignore keyboard input and step env through bench_actions
+            (default BENCH_ACTIONS) bench_steps times without sleeping, printing
+            action_name,success,elapsed_ms as CSV and the overall steps/sec.
+        min_interval: Per-action repeat gate in seconds. Presses of the same action closer
+            together than this (OS key-repeat while held) are dropped; each action has its
+            own clock, so holding W does not delay P.
+        min_step_interval: Minimum time between env.step() starts (default one 30 FPS frame).
+            The worker waits out the rest of the frame before taking the next action, so a
+            newer move/look can still replace the queued one. 0 disables the throttle.
     """
-    key_queue: queue.Queue[Optional[str]] = queue.Queue()
+    if bench_mode:
+        _run_benchmark(env, list(bench_actions or BENCH_ACTIONS), bench_steps)
+        return
+
+    # Hot-loop lookups bound as locals
+    key_lut = _KEY_LUT
+    action_entries = _ACTION_ENTRIES
+    coalesce_keys = COALESCE_KEYS
+    monotonic = time.monotonic
+    last_fire: dict[int, float] = {}
+
     stop_event = threading.Event()
     use_pynput = use_global_keys
 
     keyboard = None
-    listener = None
+    events = None
+    # Owns the pynput listener: closing it runs Events.__exit__, which stops the listener
+    # thread and pushes the sentinel that wakes a blocking events.get()
+    listener_stack = contextlib.ExitStack()
 
     if use_global_keys:
         try:
@@ -85,86 +247,211 @@ def run_keyboard_loop(
                 "  pip install pynput"
             )
 
-    def on_press(key) -> None:
-        if stop_event.is_set():
-            return
-        try:
-            k = key.char if hasattr(key, "char") and key.char else None
-        except Exception:
-            k = None
-
-        if k is None:
-            return
-
-        k = k.lower()
-        key_queue.put(k)
-
-        if k in QUIT_KEYS:
-            stop_event.set()
-
     if use_pynput and keyboard is not None:
+        # pynput's synchronous Events API owns the listener thread and its queue
         try:
-            listener = keyboard.Listener(on_press=on_press)
-            listener.daemon = True
-            listener.start()
+            events = keyboard.Events()
+            listener_stack.enter_context(events)
         except Exception as e:
+            if events is not None:
+                # __enter__ may have started the listener thread before failing
+                events.__exit__(None, None, None)
             use_pynput = False
-            listener = None
+            events = None
             if debug_keys:
                 print(f"[keyboard] pynput failed, falling back to terminal input: {e!r}")
 
     if debug_keys:
         print(f"[keyboard] mode={'pynput(global)' if use_pynput else 'terminal'}")
 
-    try:
-        while not stop_event.is_set():
-            if use_pynput and listener is not None:
-                try:
-                    key = key_queue.get(timeout=0.25)
-                except queue.Empty:
-                    continue
-
-                while True:
-                    try:
-                        key = key_queue.get_nowait()
-                    except queue.Empty:
-                        break
-            else:
-                key = _terminal_get_key().lower()
-
-            if debug_keys:
-                print(f"[keyboard] got key={key!r}")
-
-            if key in QUIT_KEYS:
-                print("\nExiting...")
-                break
+    # Step mailbox: the worker owns env.step(). A navigation action waiting at the tail is replaced
+    # by a newer navigation action (latest wins); anything else is appended so it runs in order.
+    pending_lock = threading.Lock()
+    pending: collections.deque[tuple[int, str]] = collections.deque()
+    latest_wins = LATEST_WINS_ACTIONS
+    action_event = threading.Event()
+    # Set while an action is queued or running; the input loop only polls while this is set
+    busy = threading.Event()
+    # Worker -> input loop results. Strictly one producer and one consumer, so a bare deque is
+    # enough: append/popleft are atomic under the GIL and skip Queue's mutex + condition variable.
+    results: collections.deque[tuple[str, Any]] = collections.deque()
 
-            action_id = KEY_ACTIONS.get(key)
-            if action_id is None:
-                continue
-            if not (0 <= action_id < len(THOR_DISCRETE_ACTIONS)):
+    def step_worker() -> None:
+        last_step = float("-inf")
+        while True:
+            action_event.wait()
+            # Cap the step rate to the sim's frame rate; stop_event.wait keeps quit responsive
+            wait = min_step_interval - (monotonic() - last_step)
+            if wait > 0:
+                stop_event.wait(wait)
+            with pending_lock:
+                entry = pending.popleft() if pending else None
+                if not pending:
+                    action_event.clear()
+            if stop_event.is_set():
+                return
+            if entry is None:
                 continue
+            action_id, default_name = entry
+            last_step = monotonic()
+            try:
+                obs, reward, terminated, truncated, info = env.step(action_id)
+            except Exception as e:
+                results.append((default_name, e))
+                busy.clear()
+                return
+            results.append((default_name, info))
+            with pending_lock:
+                if not pending:
+                    busy.clear()
 
-            obs, reward, terminated, truncated, info = env.step(action_id)
-            action_name = info.get("action_name", THOR_DISCRETE_ACTIONS[action_id])
+    extract_pose: Optional[Callable[[dict], tuple[float, float, float, float]]] = None
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+
+    def report_results() -> None:
+        nonlocal extract_pose
+        wrote = False
+        while results:
+            default_name, info = results.popleft()
+            if isinstance(info, Exception):
+                raise info
+            action_name = info.get("action_name", default_name)
             success = info.get("last_action_success", True)
-            pos = info.get("agent_position") or {}
-            rot = info.get("agent_rotation")
-            if not isinstance(pos, dict):
-                pos = {}
-            ry = rot.get("y", 0) if isinstance(rot, dict) else (rot or 0)
 
             if on_action:
                 on_action(action_name, success, info)
             else:
-                px, py, pz = pos.get("x") or 0, pos.get("y") or 0, pos.get("z") or 0
-                pos_str = f"pos ({px:6.2f}, {py:5.2f}, {pz:6.2f})"
-                rot_str = f"rot y={float(ry):6.1f}°"
-                print(f"{action_name:15s}: {'✓' if success else '✗'} | {pos_str} | {rot_str}")
+                # Pick the extractor from the first step's schema; drop to the tolerant one if it changes
+                if extract_pose is None:
+                    pos, rot = info.get("agent_position"), info.get("agent_rotation")
+                    typed = isinstance(pos, dict) and isinstance(rot, dict)
+                    extract_pose = _extract_dict_pose if typed else _extract_any_pose
+                try:
+                    px, py, pz, ry = extract_pose(info)
+                except (KeyError, TypeError):
+                    extract_pose = _extract_any_pose
+                    px, py, pz, ry = extract_pose(info)
+                # gridSize=0.25 and rotateStepDegrees=90 keep poses on whole cm / degrees
+                write("%-15s: %s | pos (%4dcm, %4dcm, %4dcm) | rot y=%3d°\n" % (
+                    action_name,
+                    "✓" if success else "✗",
+                    round(px * 100),
+                    round(py * 100),
+                    round(pz * 100),
+                    round(float(ry)) % 360,
+                ))
+                wrote = True
+        # One flush per drained batch rather than one per status line
+        if wrote:
+            flush()
+
+    worker = threading.Thread(target=step_worker, daemon=True)
+    worker.start()
+
+    def stop_listener() -> None:
+        # Idempotent (ExitStack.close runs Events.__exit__ once): called as soon as quit is seen
+        # and again from finally
+        listener_stack.close()
+
+    def request_stop() -> None:
+        # Every way of ending the loop other than its own break must come through here: an idle
+        # events.get(None) only wakes for a key or the sentinel pushed by Events.__exit__
+        stop_event.set()
+        stop_listener()
+
+    raw_stdin = _RawStdin(sys.stdin.fileno()) if events is None else None
+    quit_keys = _QUIT_TERM if events is None else _QUIT_PYNPUT
+
+    held_keys: collections.deque[str] = collections.deque()
+
+    try:
+        with raw_stdin if raw_stdin is not None else contextlib.nullcontext():
+            while not stop_event.is_set():
+                # Block indefinitely when idle; poll only while a step result is still outstanding.
+                # busy is read before draining so a result posted just before it cleared is not missed.
+                timeout = 0.05 if busy.is_set() else None
+                report_results()
+                if held_keys:
+                    key = held_keys.popleft()
+                elif events is not None:
+                    event = events.get(timeout)
+                    if event is None:
+                        if timeout is None:
+                            break  # sentinel from Events.__exit__ (request_stop)
+                        continue
+                    if not isinstance(event, keyboard.Events.Press):
+                        continue
+                    key = _key_char(event.key)
+                    if key is None:
+                        continue
+
+                    # A run of move/look presses that queued up while the previous one was handled
+                    # collapses to the newest (with the latest-wins step mailbox this bounds held-key
+                    # lag to one env.step). Any other key ends the run and is kept, in order, for the
+                    # following iterations.
+                    if key in coalesce_keys:
+                        while True:
+                            event = events.get(0)
+                            if event is None:
+                                break
+                            if not isinstance(event, keyboard.Events.Press):
+                                continue
+                            k = _key_char(event.key)
+                            if k is None:
+                                continue
+                            if k in quit_keys:
+                                # Quit skips whatever else is queued instead of waiting its turn
+                                key = k
+                                held_keys.clear()
+                                break
+                            if k in coalesce_keys and not held_keys:
+                                key = k
+                            else:
+                                held_keys.append(k)
+                else:
+                    # Waiting on the selector lets step results be handled while a step is in flight and no key is typed
+                    if not raw_stdin.wait(timeout):
+                        continue
+                    key = raw_stdin.read_key()
+
+                if debug_keys:
+                    print(f"[keyboard] got key={key!r}")
+
+                if key in quit_keys:
+                    # Release the global keyboard hook before teardown, not after the worker join
+                    request_stop()
+                    print("\nExiting...")
+                    break
+
+                o = ord(key) if len(key) == 1 else 128
+                action_id = key_lut[o] if o < 128 else -1
+                if action_id < 0:
+                    continue
+                entry = action_entries[action_id]
+                now = monotonic()
+                if now - last_fire.get(action_id, -min_interval) < min_interval:
+                    continue
+                last_fire[action_id] = now
+
+                with pending_lock:
+                    if pending and action_id in latest_wins and pending[-1][0] in latest_wins:
+                        pending[-1] = entry
+                    else:
+                        pending.append(entry)
+                    busy.set()
+                    action_event.set()
+    except KeyboardInterrupt:
+        # With pynput the terminal is cooked, so Ctrl+C is a SIGINT rather than a "\x03" key.
+        # SIGINT keeps its default handler (a handler running Events.__exit__ could deadlock on
+        # the queue lock events.get() holds); the interrupted get() lands here and shuts down
+        # through the normal quit path.
+        request_stop()
+        print("\nExiting...")
     finally:
         stop_event.set()
-        if listener is not None:
-            try:
-                listener.stop()
-            except Exception:
-                pass
+        action_event.set()
+        stop_listener()
+        # Let an in-flight env.step() finish before the caller closes the env
+        worker.join()
+    report_results()
@@ -1,10 +1,33 @@
-"""Validators for declarative spec and house edits."""
+"""Validators for declarative spec and house edits.
 
-from .declarative_spec import validate_declarative_spec_strict
-from .house_edit import validate_house_edit_request, validate_edited_house_dict
+Submodules are imported on first attribute access (PEP 562), so importing one
+validator does not pay for the others.
+"""
+
+from importlib import import_module
+from typing import Any
+
+_LAZY = {
+    "validate_declarative_spec_strict": "declarative_spec",
+    "validate_house_edit_request": "house_edit",
+    "validate_edited_house_dict": "house_edit",
+}
 
 __all__ = [
     "validate_declarative_spec_strict",
     "validate_house_edit_request",
     "validate_edited_house_dict",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))